@@ -1,11 +1,22 @@
 import pygame._sdl2.audio as sdl2_audio
+from functools import lru_cache
 from pygame import mixer
 import numpy as np
 import threading
 import platform
+import random
 import time
+import sys
 import yaml
 import os
+try:
+    # libyaml bindings, much faster than the pure python loader and dumper
+    from yaml import CSafeLoader as SafeLoader, CDumper as Dumper
+except ImportError:
+    from yaml import SafeLoader, Dumper
+
+yes_answers = ('y', 'yes', '')  # Lowercase answers accepted as yes
+
 try:
     import vgamepad as vg
     controller_available = True
@@ -17,10 +28,10 @@ except Exception:
     if platform.system() == 'Windows':
         n = input("ViGEmBus driver not found, Would you like to open the download page? [y]es [n]o: ")
         os.system('cls')
-        if n.lower() == 'y' or n == '' or n.lower() == 'yes':
+        if n.lower() in yes_answers:
             os.startfile("https://github.com/nefarius/ViGEmBus/releases/latest")
         n = input("Would you like to continue with no controller functions? [y]es [n]o: ")
-        if n.lower() == 'y' or n == '' or n.lower() == 'yes':
+        if n.lower() in yes_answers:
             controller_available = False
         else:
             quit()
@@ -90,12 +101,23 @@ pause = False  # Pause all sounds
 warning = True  # Display warning message on entering control menu
 
 sounds = []  # List for storing sinewave sounds
+loaded_waves = None  # Frequencies and amplitude sounds were built with
+wave_sounds = {}  # Built sounds keyed by (frequency, amplitude)
+channels = []  # Mixer channels the sounds are playing on
+channel_lock = threading.Lock()  # Held while rebuilding or writing channels
 
 # Changing half_rum can lead to math problems
 half_rum = 127.5  # Used to switch channels, Calculate steps: 127.5
 
 sample_rate = 44100  # Sample rate for sinewave: 44100
 
+# Time left before a loop step where we stop sleeping and spin instead,
+# sleep on Windows before Python 3.11 can overshoot by ~15 ms
+if platform.system() == 'Windows' and sys.version_info < (3, 11):
+    spin_time = 0.02
+else:
+    spin_time = 0.001
+
 # Empty string to store selected audio device in
 did = ''
 
@@ -103,11 +125,15 @@ zero_time = 0  # Time when hit zero
 last_zero = True  # Last motor at zero
 old_motor = 0  # Motor for checking ramp_down
 ramp_start = 0  # Time for triggering ramp_down
+ramp_check_timer = None  # Pending check for triggering ramp_down
+channel_volumes = None  # Last (left, right) volume set on every channel, guarded by channel_lock
+ramp_id = 0  # Id of the newest volume ramp, older ramps stop when it changes
+ramp_lock = threading.Lock()  # Guards ramp_id and ramp volume writes
 
 
 def create_config_file():
     with open(config_file, 'w') as f:
-        yaml.dump(settings, f)
+        yaml.dump(settings, f, Dumper=Dumper)
 
 
 def load_config():
@@ -115,31 +141,29 @@ def load_config():
     default_settings = settings
     try:
         with open(config_file, 'r') as f:
-            settings = yaml.safe_load(f)
+            settings = yaml.load(f, Loader=SafeLoader)
         if not settings:
             # Has config file but it's empty
             settings = {}
+        changed = False
         for _ in default_settings:
             if _ not in settings:
                 print(f'Added new variable "{_}" to {config_file}')
-                update_config(_, default_settings[_])
+                settings[_] = default_settings[_]
+                changed = True
         for _ in dict(settings):
             if _ not in default_settings:
                 settings.pop(_)
                 print(f'Removed unused variable "{_}" from {config_file}')
-                create_config_file()
+                changed = True
+        if changed:
+            # Write every added and removed variable at once
+            create_config_file()
     except FileNotFoundError:
         print(f'Config file not found, creating new {config_file}.')
         create_config_file()
 
 
-def update_config(var_name, new_value):
-    global settings
-    settings[var_name] = new_value
-    with open(config_file, 'w') as f:
-        yaml.dump(settings, f)
-
-
 def open_programs(programs):
     if programs != []:
         for program in programs:
@@ -203,15 +227,29 @@ def find_r_vol(motor, rminvol, rmaxvol):
     return rvol
 
 
+@lru_cache(maxsize=None)
+def sample_phases(sample_rate):
+    # Phase of every sample in one second of a 1 Hz wave, built once and
+    # scaled by frequency for each generated wave
+    phases = np.arange(sample_rate) * (2 * np.pi / sample_rate)
+    phases.setflags(write=False)
+    return phases
+
+
 def generate_sinewave(frequency, sample_rate, amp):
-    sinewave = np.sin(2 * np.pi * np.arange(sample_rate)
-                      * float(frequency) / sample_rate).astype(np.float32) * amp
+    # Work in place so each step doesn't allocate another second of samples
+    sinewave = sample_phases(sample_rate) * float(frequency)
+    np.sin(sinewave, out=sinewave)
+    sinewave = sinewave.astype(np.float32)
+    sinewave *= amp
     return sinewave
 
 
 def generate_squarewave(frequency, sample_rate, amp):
-    squarewave = np.sign(np.sin(2 * np.pi * np.arange(sample_rate)
-                                * float(frequency) / sample_rate)) * amp
+    squarewave = sample_phases(sample_rate) * float(frequency)
+    np.sin(squarewave, out=squarewave)
+    np.sign(squarewave, out=squarewave)
+    squarewave *= amp
     return squarewave
 
 
@@ -246,32 +284,58 @@ def select_device():
             print('\n')
 
 
+def new_ramp_id():
+    # Take the id for a new ramp, stopping any ramp already running
+    global ramp_id
+    with ramp_lock:
+        ramp_id += 1
+        return ramp_id
+
+
 def ramp_volume(ramp):
     # Ramp the volume of Sound up or down over the set time
+    # Returns False if a newer ramp took over before this one finished
     if settings['print_volumes']:
         print(f'Ramping volume {ramp}...')
-    if ramp == 'up':
-        for i in range(round(settings['ramp_up_steps']) + 1):
-            if settings['print_volumes']:
-                print(f'{(i / settings["ramp_up_steps"])} / 1.0')
-            for sound in sounds:
-                mixer.Sound.set_volume(sound, (i / settings['ramp_up_steps']))
-            time.sleep(settings['ramp_up_time'] / settings['ramp_up_steps'])
-    elif ramp == 'down':
-        for i in reversed(range(round(settings['ramp_down_steps']) + 1)):
-            if settings['print_volumes']:
-                print(f'{(i / settings["ramp_down_steps"])} / 1.0')
-            for sound in sounds:
-                mixer.Sound.set_volume(sound, (i / settings['ramp_down_steps']))
-            time.sleep(settings['ramp_down_time'] / settings['ramp_down_steps'])
+    if ramp not in ('up', 'down'):
+        return True
+    this_ramp = new_ramp_id()
+    volume_setters = [sound.set_volume for sound in sounds]
+    # Fixed for the whole ramp, so only work them out once
+    steps = settings[f'ramp_{ramp}_steps']
+    step_time = settings[f'ramp_{ramp}_time'] / steps
+    print_volumes = settings['print_volumes']
+    levels = range(round(steps) + 1)
+    if ramp == 'down':
+        levels = reversed(levels)
+    for i in levels:
+        volume = i / steps
+        # Check and write together so a newer ramp can't be overwritten
+        with ramp_lock:
+            if this_ramp != ramp_id:
+                return False
+            for set_volume in volume_setters:
+                set_volume(volume)
+        if print_volumes:
+            print(f'{volume} / 1.0')
+        time.sleep(step_time)
+    return True
+
+
+def start_ramp_up():
+    # Silence the sounds and ramp them back up in the background
+    for sound in sounds:
+        sound.set_volume(0.0)
+    volume_ramp_up_thread = threading.Thread(target=ramp_volume, args=('up',))
+    volume_ramp_up_thread.start()
 
 
 def ramp_check(motor):
     # Check if the motor is still at old_motor after waiting inactive_time_d
     global last_zero
     if old_motor == motor and time.time() - ramp_start >= settings['idle_time_before_ramp_down']:
-        ramp_volume('down')
-        last_zero = True
+        if ramp_volume('down'):
+            last_zero = True
 
 
 def volume_from_motor(motor):
@@ -280,41 +344,50 @@ def volume_from_motor(motor):
     global last_zero
     global old_motor
     global ramp_start
+    global ramp_check_timer
+    global channel_volumes
+
+    # Read once, these are checked on every path below
+    now = time.time()
+    ramp_up_enabled = settings['ramp_up_enabled']
+    ramp_down_enabled = settings['ramp_down_enabled']
 
     if not check_rumble(motor):
-        if settings['ramp_up_enabled']:
-            zero_time = time.time()
+        if ramp_up_enabled:
+            zero_time = now
             last_zero = True
-        if not settings['always_set_volume']:
-            pass
-        else:
-            for i in range(0, len(sounds)):
-                mixer.Channel(i).set_volume(0.0, 0.0)
+        if settings['always_set_volume']:
+            with channel_lock:
+                if channel_volumes != (0.0, 0.0):
+                    for channel in channels:
+                        channel.set_volume(0.0, 0.0)
+                    channel_volumes = (0.0, 0.0)
         return
 
-    if settings['ramp_down_enabled'] and not settings['ramp_up_enabled']:
+    if ramp_down_enabled and not ramp_up_enabled:
         for sound in sounds:
-            mixer.Sound.set_volume(sound, 1.0)
+            sound.set_volume(1.0)
 
     lvol = find_l_vol(motor, settings['left_min_vol'], settings['left_max_vol'])
     rvol = find_r_vol(motor, settings['right_min_vol'], settings['right_max_vol'])
 
-    if settings['ramp_up_enabled'] and last_zero and time.time() - zero_time >= settings['idle_time_before_ramp_up']:
-        volume_ramp_up_thread = threading.Thread(target=ramp_volume, args=('up',))
-        for sound in sounds:
-            mixer.Sound.set_volume(sound, 0.0)
-        volume_ramp_up_thread.start()
+    if ramp_up_enabled and last_zero and now - zero_time >= settings['idle_time_before_ramp_up']:
+        start_ramp_up()
 
-    for i in range(0, len(sounds)):
-        try:
-            mixer.Channel(i).set_volume(lvol, rvol)
-        except IndexError:
-            pass
+    # Compare, write and record together so the record always matches the channels
+    with channel_lock:
+        if channel_volumes != (lvol, rvol):
+            for channel in channels:
+                channel.set_volume(lvol, rvol)
+            channel_volumes = (lvol, rvol)
     last_zero = False
 
-    if settings['ramp_down_enabled']:
+    if ramp_down_enabled:
         old_motor = motor
-        ramp_start = time.time()
+        ramp_start = now
+        # Restart the idle countdown, the pending check could no longer pass
+        if ramp_check_timer is not None:
+            ramp_check_timer.cancel()
         ramp_check_timer = threading.Timer(settings['idle_time_before_ramp_down'], ramp_check, args=(motor,))
         ramp_check_timer.start()
 
@@ -333,12 +406,21 @@ def rumble(client, target, large_motor, small_motor, led_number, user_data):
 
 
 def delay_speed(delay=settings['delay_loop_speed']):
-    time.sleep(0.1)
     time.sleep(delay)
     print('Enabling random loop speed...')
     settings['randomize_loop_speed'] = True
 
 
+def wait_until(deadline):
+    # Sleep until close to the perf_counter deadline, then spin the rest
+    # so short loop steps stay accurate
+    remaining = deadline - time.perf_counter() - spin_time
+    if remaining > 0:
+        time.sleep(remaining)
+    while time.perf_counter() < deadline:
+        pass
+
+
 def loop_motor():
     multi = 0.90
     print("Starting Loop...")
@@ -349,35 +431,30 @@ def loop_motor():
         delay_speed_thread.start()
 
     if settings['ramp_up_enabled']:
-        volume_ramp_up_thread = threading.Thread(target=ramp_volume, args=('up',))
-        for sound in sounds:
-            mixer.Sound.set_volume(sound, 0.0)
-        volume_ramp_up_thread.start()
+        start_ramp_up()
 
     while not loop.is_set():
+        # Step timing only changes between sweeps
+        total_steps = max(settings['max_loop'] - settings['min_loop'] + 1, 1)
+        step_time = settings['loop_transition_time'] / total_steps
+
         for i in range(settings['min_loop'], settings['max_loop'] + 1):
             if loop.is_set():
                 break
-            total_steps = settings['max_loop'] - settings['min_loop'] + 1
-            step_time = settings['loop_transition_time'] / total_steps
             volume_from_motor(i)
-            timer = time.time()
-            while timer + step_time > time.time():
-                pass
+            wait_until(time.perf_counter() + step_time)
+
+        total_steps = max(settings['max_loop'] - settings['min_loop'] + 1, 1)
+        step_time = settings['loop_transition_time'] / total_steps
 
         for i in reversed(range(settings['min_loop'], settings['max_loop'] + 1)):
             if loop.is_set():
                 break
-            total_steps = settings['max_loop'] - settings['min_loop'] + 1
-            step_time = settings['loop_transition_time'] / total_steps
             volume_from_motor(i)
-            timer = time.time()
-            while timer + step_time > time.time():
-                pass
+            wait_until(time.perf_counter() + step_time)
 
         if settings['randomize_loop_range']:
             # Randomly change the loop min/max using set {loop_ranges}
-            import random
             if random.randint(1, 10) == 8:
                 rand_range = random.choice(settings['loop_ranges'])
                 minchange = rand_range[0]
@@ -402,7 +479,6 @@ def loop_motor():
                 settings['max_loop'] = maxchange
 
         if settings['randomize_loop_speed']:
-            import random
             settings['loop_transition_time'] *= multi
 
             # Randomly increase the loop time with a decreasing probability.
@@ -429,16 +505,112 @@ def loop_motor():
 
 def reload_mixer():
     global sounds
+    global loaded_waves
+    global wave_sounds
+    global channel_volumes
+    global channels
+    waves = (tuple(settings['sinewave_freqs']), settings['amplitude'])
+    if sounds and waves == loaded_waves:
+        # Already playing these waves, nothing to rebuild
+        return
+    loaded_waves = waves
+    # Stop any running ramp, it would keep setting the volume of reused sounds
+    new_ramp_id()
+    # Only generate sounds for waves that were not already built
+    built = {}
     sounds = []
     for wave in settings['sinewave_freqs']:
-        sound = mixer.Sound(generate_sinewave(wave, sample_rate, settings['amplitude']))
+        key = (wave, settings['amplitude'])
+        sound = built.get(key) or wave_sounds.get(key)
+        if sound is None:
+            sound = mixer.Sound(generate_sinewave(wave, sample_rate, settings['amplitude']))
+        else:
+            sound.set_volume(1.0)
+        built[key] = sound
         sounds.append(sound)
-    mixer.stop()
-    mixer.set_num_channels(len(sounds))
-    for i in range(0, len(sounds)):
-        mixer.Channel(i).set_volume(0.0, 0.0)
-    for sound in sounds:
-        sound.play(-1)
+    wave_sounds = built
+    # Motor events wait until the channels match the new channel count
+    with channel_lock:
+        mixer.stop()
+        mixer.set_num_channels(len(sounds))
+        channels = [mixer.Channel(i) for i in range(len(sounds))]
+        for channel in channels:
+            channel.set_volume(0.0, 0.0)
+        channel_volumes = (0.0, 0.0)
+        for sound in sounds:
+            sound.play(-1)
+
+
+# Main menu on/off options: input -> (setting, enabled message, disabled message)
+toggles = {
+    'v': ('print_volumes', 'Printing volumes', 'Not printing volumes'),
+    'vv': ('print_motor_states', 'Printing motor states', 'Not printing motor states'),
+    'h': ('channel_switch_half_way', 'Switching at half motor', 'Not switching at half motor'),
+    'e': ('extend_lvol', 'Extending left volume', 'Not extending left volume'),
+}
+
+# Same as toggles, only available while looping
+loop_toggles = {
+    'rs': ('randomize_loop_speed', 'Enabling random loop speed', 'Disabling random loop speed'),
+    'rr': ('randomize_loop_range', 'Enabling random_range', 'Disabling random_range'),
+}
+
+
+def toggle_setting(name, enabled_message, disabled_message):
+    settings[name] = not settings[name]
+    if settings[name]:
+        print(enabled_message)
+    else:
+        print(disabled_message)
+
+
+def toggle_pause():
+    # Pause or resume all sounds
+    global pause
+    if pause is False:
+        print('Pausing sound...')
+        pause = True
+        mixer.pause()
+    else:
+        print('Resuming sound...')
+        pause = False
+        mixer.unpause()
+
+
+# Volume menu answers -> channels to edit
+volume_sides = {
+    'l': ('left',),
+    'r': ('right',),
+    'b': ('left', 'right'),
+}
+
+
+def edit_volumes(bound):
+    # Edit the 'min' or 'max' volume of the left, right or both channels
+    print('[l]eft [r]ight or [b]oth sides?')
+    n = input("")
+    if n not in volume_sides:
+        return
+    sides = volume_sides[n]
+    for side in sides:
+        print(f'Current {side} {bound}vol: {settings[f"{side}_{bound}_vol"]}')
+    if len(sides) == 1:
+        name = f'{sides[0]} {bound}vol'
+        target = name
+    else:
+        name = f'{bound}vol'
+        target = f'both {bound}vols'
+    try:
+        n = input(f"Enter desired {name} between 0.0 and 1.0: ")
+        vol = float(n)
+        assert 0.0 <= vol <= 1.0
+    except (ValueError, AssertionError):
+        print('\n')
+        print('Numbers between 0.0 and 1.0 only')
+        return
+    print(f'Setting {target} to {n}...')
+    for side in sides:
+        settings[f'{side}_{bound}_vol'] = vol
 
 
 def print_help():
@@ -563,46 +735,15 @@ Do you have any active audio devices?')
     while 1 == 1:
         print_help()
         n = input("\n")
-        if n == 'v':
-            if settings['print_volumes'] is True:
-                settings['print_volumes'] = False
-                print('Not printing volumes')
-            else:
-                settings['print_volumes'] = True
-                print('Printing volumes')
-        elif n == 'vv':
-            if settings['print_motor_states'] is True:
-                settings['print_motor_states'] = False
-                print('Not printing motor states')
-            else:
-                settings['print_motor_states'] = True
-                print('Printing motor states')
+        if n in toggles:
+            toggle_setting(*toggles[n])
+        elif n in loop_toggles and looping:
+            toggle_setting(*loop_toggles[n])
         elif n == 'x' and controller_available:
             print('Pressing start four times...')
             spam_buttons()
-        elif n == 'h':
-            if settings['channel_switch_half_way'] is True:
-                settings['channel_switch_half_way'] = False
-                print('Not switching at half motor')
-            else:
-                settings['channel_switch_half_way'] = True
-                print('Switching at half motor')
-        elif n == 'e':
-            if settings['extend_lvol'] is True:
-                settings['extend_lvol'] = False
-                print("Not extending left volume")
-            else:
-                settings['extend_lvol'] = True
-                print("Extending left volume")
         elif n == 'p':
-            if pause is False:
-                print('Pausing sound...')
-                pause = True
-                mixer.pause()
-            else:
-                print('Resuming sound...')
-                pause = False
-                mixer.unpause()
+            toggle_pause()
         elif n == 'l':
             open_programs(settings['program_list'])
         elif n == 'c':
@@ -631,80 +772,16 @@ Do you have any active audio devices?')
                         n = input("Enter desired amplitude: ")
                         print(f'Setting amplitude to {n}...')
                         settings['amplitude'] = float(n)
-                        sounds = []
                         reload_mixer()
                     except ValueError:
                         print('\n')
                         print('Numbers only')
                 elif n == 'mi':
-                    print('[l]eft [r]ight or [b]oth sides?')
-                    n = input("")
-                    try:
-                        if n == 'l':
-                            print(f'Current left minvol: {settings["left_min_vol"]}')
-                            n = input("Enter desired left minvol between 0.0 and 1.0: ")
-                            assert float(n) >= 0.0 and float(n) <= 1.0
-                            print(f'Setting left minvol to {n}...')
-                            settings['left_min_vol'] = float(n)
-                        elif n == 'r':
-                            print(f'Current right minvol: {settings["right_min_vol"]}')
-                            n = input("Enter desired right minvol between 0.0 and 1.0: ")
-                            assert float(n) >= 0.0 and float(n) <= 1.0
-                            print(f'Setting right minvol to {n}...')
-                            settings['right_min_vol'] = float(n)
-                        elif n == 'b':
-                            print(f'Current left minvol: {settings["left_min_vol"]}')
-                            print(f'Current right minvol: {settings["right_min_vol"]}')
-                            n = input("Enter desired minvol between 0.0 and 1.0: ")
-                            assert float(n) >= 0.0 and float(n) <= 1.0
-                            print(f'Setting both minvols to {n}...')
-                            settings['left_min_vol'] = float(n)
-                            settings['right_min_vol'] = float(n)
-                    except ValueError:
-                        print('\n')
-                        print('Numbers between 0.0 and 1.0 only')
-                    except AssertionError:
-                        print('\n')
-                        print('Numbers between 0.0 and 1.0 only')
+                    edit_volumes('min')
                 elif n == 'ma':
-                    print('[l]eft [r]ight or [b]oth sides?')
-                    n = input("")
-                    try:
-                        if n == 'l':
-                            print(f'Current left maxvol: {settings["left_max_vol"]}')
-                            n = input("Enter desired left maxvol between 0.0 and 1.0: ")
-                            assert float(n) >= 0.0 and float(n) <= 1.0
-                            print(f'Setting left maxvol to {n}...')
-                            settings['left_max_vol'] = float(n)
-                        elif n == 'r':
-                            print(f'Current right maxvol: {settings["right_max_vol"]}')
-                            n = input("Enter desired right maxvol between 0.0 and 1.0: ")
-                            assert float(n) >= 0.0 and float(n) <= 1.0
-                            print(f'Setting right maxvol to {n}...')
-                            settings['right_max_vol'] = float(n)
-                        elif n == 'b':
-                            print(f'Current left maxvol: {settings["left_max_vol"]}')
-                            print(f'Current right maxvol: {settings["right_max_vol"]}')
-                            n = input("Enter desired maxvol between 0.0 and 1.0: ")
-                            assert float(n) >= 0.0 and float(n) <= 1.0
-                            print(f'Setting both maxvols to {n}...')
-                            settings['left_max_vol'] = float(n)
-                            settings['right_max_vol'] = float(n)
-                    except ValueError:
-                        print('\n')
-                        print('Numbers between 0.0 and 1.0 only')
-                    except AssertionError:
-                        print('\n')
-                        print('Numbers between 0.0 and 1.0 only')
+                    edit_volumes('max')
                 elif n == 'p':
-                    if pause is False:
-                        print('Pausing sound')
-                        pause = True
-                        mixer.pause()
-                    else:
-                        print('Resuming sound')
-                        pause = False
-                        mixer.unpause()
+                    toggle_pause()
                 elif n == 'r' or n == 'rd':
                     if n == 'r':
                         _ = 'up'
@@ -730,34 +807,34 @@ Do you have any active audio devices?')
                         elif n == '2':
                             n = input(f"Enter new ramp {_} time in seconds: ")
                             try:
-                                settings[f'ramp_{_}_time'] = float(n)
-                                print(f'Setting ramp {_} time to: {float(n)} seconds')
+                                value = float(n)
+                                settings[f'ramp_{_}_time'] = value
+                                print(f'Setting ramp {_} time to: {value} seconds')
                             except ValueError:
                                 print('\n')
                                 print('Numbers only')
                         elif n == '3':
                             n = input(f"Enter new number of ramp {_} steps: ")
                             try:
-                                settings[f'ramp_{_}_steps'] = float(n)
-                                print(f'Setting ramp {_} steps to: {float(n)}')
+                                value = float(n)
+                                settings[f'ramp_{_}_steps'] = value
+                                print(f'Setting ramp {_} steps to: {value}')
                             except ValueError:
                                 print('\n')
                                 print('Numbers only')
                         elif n == '4':
                             n = input("Enter new idle time in seconds: ")
                             try:
-                                settings[f'idle_time_before_ramp_{_}'] = float(n)
-                                print(f'Setting idle time to: {float(n)} seconds')
+                                value = float(n)
+                                settings[f'idle_time_before_ramp_{_}'] = value
+                                print(f'Setting idle time to: {value} seconds')
                             except ValueError:
                                 print('\n')
                                 print('Numbers only')
                         else:
                             break
                 if n == 'l':
-                    configs = []
-                    for file in os.listdir(os.getcwd()):
-                        if file.endswith('.yaml'):
-                            configs.append(file)
+                    configs = [file for file in os.listdir(os.getcwd()) if file.endswith('.yaml')]
                     print('\n')
                     print(f'yaml files found: {configs}')
                     print('\n')
@@ -782,8 +859,7 @@ Do you have any active audio devices?')
                         n = n + '.yaml'
                     config_file = n
                     print(f'\nUpdating {config_file} with the current settings...')
-                    for _ in settings:
-                        update_config(_, settings[_])
+                    create_config_file()
                 elif n == 'c':
                     break
         elif n == 't':
@@ -808,9 +884,10 @@ Do you have any active audio devices?')
             try:
                 print(f'Current max loop: {settings["max_loop"]}')
                 n = input("Enter desired max loop between 1 and 255: ")
-                assert int(n) >= 1 and int(n) <= 255
+                max_loop = int(n)
+                assert 1 <= max_loop <= 255
                 print(f'Setting max loop to {n}...')
-                settings['max_loop'] = int(n)
+                settings['max_loop'] = max_loop
             except ValueError:
                 print('\n')
                 print('Numbers only')
@@ -821,22 +898,16 @@ Do you have any active audio devices?')
             try:
                 print(f'Current min loop: {settings["min_loop"]}')
                 n = input("Enter desired min loop between 0 and 254: ")
-                assert int(n) >= 0 and int(n) <= 254
+                min_loop = int(n)
+                assert 0 <= min_loop <= 254
                 print(f'Setting min loop to {n}...')
-                settings['min_loop'] = int(n)
+                settings['min_loop'] = min_loop
             except ValueError:
                 print('\n')
                 print('Numbers only')
             except AssertionError:
                 print('\n')
                 print('Numbers between 0 and 254 only')
-        elif n == 'rs' and looping:
-            if not settings['randomize_loop_speed']:
-                print(f'Enabling random loop speed')
-                settings['randomize_loop_speed'] = True
-            else:
-                print(f'Disabling random loop speed')
-                settings['randomize_loop_speed'] = False
         elif n == 'rsd' and looping:
             n = input(f'Enter time in seconds to delay (press Enter for {settings["loop_speed_delay"]}): ')
             try:
@@ -847,13 +918,6 @@ Do you have any active audio devices?')
             except ValueError:
                 print('\n')
                 print('Numbers only')
-        elif n == 'rr' and looping:
-            if not settings['randomize_loop_range']:
-                print(f'Enabling random_range')
-                settings['randomize_loop_range'] = True
-            else:
-                print(f'Disabling random_range')
-                settings['randomize_loop_range'] = False
         elif n == 'q':
             print('Quitting...')
             mixer.quit()